@@ -1,7 +1,46 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import os
+import re
+import hashlib
 import logging
 
+try:
+    import python_calamine  # noqa: F401
+
+    # Rust 实现的 Excel 解析器，速度远高于 openpyxl
+    EXCEL_ENGINE = "calamine"
+except ImportError:  # pragma: no cover - python-calamine optional
+    # pandas 的 openpyxl 读取器以 read_only / data_only 模式流式读取
+    EXCEL_ENGINE = "openpyxl"
+
+try:
+    import xxhash
+
+    # 数据指纹仅用于缓存比对，无需密码学强度；xxh3 比 SHA-256 快数倍
+    _new_hasher = xxhash.xxh3_64
+except ImportError:  # pragma: no cover - xxhash optional
+    _new_hasher = hashlib.sha256
+
+# 文件名中不允许出现的字符 (仅保留字母数字、空格、"."、"-"、"_")
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w .\-]")
+
+
+def safe_filename(name):
+    """
+    去除名称中不适合用作文件名的字符。
+
+    Args:
+        name (str): 原始名称，如工作表名或日期区间。
+
+    Returns:
+        str: 可安全用作文件名的字符串。
+    """
+    return _UNSAFE_FILENAME_RE.sub("", str(name)).strip()
+
 
 class EnergySheet:
     """
@@ -14,7 +53,8 @@ class EnergySheet:
         file_path (str): Excel 文件完整路径。
         sheet_name (str): 工作表名称 (通常代表日期区间)。
         file_name (str): Excel 文件名。
-        raw_df (pd.DataFrame): 原始读取的数据。
+        raw_df (pd.DataFrame | None): 原始读取的数据，清洗完成后释放
+            (需要时通过 get_raw 重新读取)。
         processed_df (pd.DataFrame): 清洗后的数据。
         summary_df (pd.DataFrame): 分组汇总后的数据。
     """
@@ -22,25 +62,112 @@ class EnergySheet:
     # 定义需要统计的目标能源类型
     TARGET_TYPES = ["电", "采暖热表", "生活热水表", "自来水", "中水", "燃气"]
     REQUIRED_COLS = ["能源类型", "实际消耗", "费用(元)"]
-
-    def __init__(self, file_path, sheet_name):
+    # 读取 Excel 时只解析下游用到的列 (表号可选)
+    READ_COLS = REQUIRED_COLS + ["表号"]
+    READ_DTYPES = {"表号": str, "能源类型": str}
+    # 原始工作表缓存子目录 (位于缓存目录下，每个工作表一个文件，源文件修改后覆盖)
+    RAW_CACHE_SUBDIR = "raw_sheets"
+    # 原始工作表缓存的 Parquet 元数据字段：记录修改时间和缓存格式标记
+    RAW_CACHE_KEY_FIELD = b"energy_data.raw_cache_key"
+    # Parquet 缓存写入参数：zstd 解码快于 snappy 且压缩率更高；
+    # 缓存只用于整表读取和比对，不需要列统计信息
+    PARQUET_WRITE_OPTIONS = {
+        "compression": "zstd",
+        "compression_level": 3,
+        "write_statistics": False,
+    }
+    # Arrow 表转为 DataFrame 的参数：按列拆分数据块并边转换边释放 Arrow 内存，
+    # 转换期间不会同时持有两份完整数据
+    TO_PANDAS_OPTIONS = {"split_blocks": True, "self_destruct": True}
+    # 缓存格式版本：清洗逻辑或缓存内容变化时递增，使旧的文件指纹失效
+    CACHE_VERSION = 1
+    # 缓存数据文件旁的指纹文件后缀
+    DIGEST_SUFFIX = ".digest"
+
+    def __init__(
+        self, file_path, sheet_name, raw_df=None, processed_df=None, cache_dir=None
+    ):
         """
         初始化 EnergySheet 实例并自动执行加载和处理。
 
         Args:
             file_path (str): Excel 文件路径。
             sheet_name (str): 工作表名称。
+            raw_df (pd.DataFrame | None): 预先读取的原始数据 (见 from_frame)，
+                为 None 时自行读取工作表。
+            processed_df (pd.DataFrame | None): 已清洗的数据 (见 from_cache)，
+                提供时跳过读取和清洗，直接生成汇总。
+            cache_dir (str | None): 缓存目录，提供时在其下缓存原始工作表的
+                解析结果，为 None 时不使用原始数据缓存。
         """
         self.file_path = file_path
         self.sheet_name = sheet_name
         self.file_name = os.path.basename(file_path)
         self.logger = logging.getLogger(__name__)
-        self.raw_df: pd.DataFrame | None = None
-        self.processed_df: pd.DataFrame | None = None
+        self.cache_dir = cache_dir
+        self.raw_df: pd.DataFrame | None = raw_df
+        self.processed_df: pd.DataFrame | None = processed_df
         self.summary_df: pd.DataFrame | None = None
+        # 能源类型 -> (总实际消耗, 总费用)，供 get_total_by_type 直接查表
+        self._totals: dict[str, tuple[float, float]] = {}
+        # 工作表缺少的必需列 (非数据工作表，如封面或说明页)，读取后设置
+        self.missing_cols: list[str] = []
+        # 清洗后数据的指纹，首次使用时计算 (比对缓存与保存缓存共用)
+        self._digest: str | None = None
+
+        # 初始化时自动加载并处理 (已提供清洗后的数据时只需生成汇总)
+        if self.processed_df is not None:
+            self._generate_summary()
+        else:
+            self._load_and_process()
+
+    @classmethod
+    def from_frame(cls, df, sheet_name, source_path, cache_dir=None):
+        """
+        由已读取的工作表数据构建实例，不再重新打开 Excel 文件。
+
+        df 会被直接清洗 (就地修改列)，调用后不应再使用；
+        如需保留原始数据，请传入 df.copy()。
+
+        Args:
+            df (pd.DataFrame): 工作表原始数据 (如 iter_workbook 的产出)。
+            sheet_name (str): 工作表名称。
+            source_path (str): 数据来源的 Excel 文件路径。
+            cache_dir (str | None): 缓存目录，之后 get_raw 重新读取时
+                使用其中的原始数据缓存。
+
+        Returns:
+            EnergySheet: 已完成清洗和汇总的实例。
+        """
+        return cls(source_path, sheet_name, raw_df=df, cache_dir=cache_dir)
 
-        # 初始化时自动加载并处理
-        self._load_and_process()
+    @classmethod
+    def from_cache(cls, file_path, sheet_name, cache_dir, format="feather"):
+        """
+        由缓存的清洗后数据构建实例，不打开 Excel 文件。
+
+        用于源文件未发生变化的情况：缓存已在之前的运行中与源数据比对一致。
+
+        Args:
+            file_path (str): 数据来源的 Excel 文件路径。
+            sheet_name (str): 工作表名称。
+            cache_dir (str): 缓存目录。
+            format (str): 缓存文件格式。
+
+        Returns:
+            EnergySheet | None: 已生成汇总的实例；缓存不存在或无法读取时返回 None。
+        """
+        cache_path = cls._cache_path_for(file_path, sheet_name, cache_dir, format)
+        if not os.path.isfile(cache_path):
+            return None
+        try:
+            processed_df = cls._read_cached_frame(cache_path, format)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"读取缓存 {cache_path} 失败: {e}")
+            return None
+        if processed_df is None:
+            return None
+        return cls(file_path, sheet_name, processed_df=processed_df)
 
     def _load_and_process(self):
         """
@@ -54,28 +181,33 @@ class EnergySheet:
         5. 调用 _generate_summary 生成汇总。
         """
         try:
-            # 1. 读取数据
-            self.raw_df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)  # type: ignore
+            # 1. 读取数据 (未预先提供时读取工作表；文件未修改时直接读取缓存)
+            if self.raw_df is None:
+                self.raw_df = self._read_raw()
 
             if self.raw_df is None:
                 return
 
             # 2. 检查列名
-            if not all(col in self.raw_df.columns for col in self.REQUIRED_COLS):
+            # (读取时只保留 READ_COLS，因此这里列出缺少的必需列而非全部列名)
+            self.missing_cols = [
+                c for c in self.REQUIRED_COLS if c not in self.raw_df.columns
+            ]
+            if self.missing_cols:
                 self.logger.error(
-                    f"文件 {self.file_name} 中的工作表 {self.sheet_name} 缺少必需列。 "
-                    f"发现: {self.raw_df.columns.tolist()}"
+                    f"文件 {self.file_name} 中的工作表 {self.sheet_name} 缺少必需列: "
+                    f"{self.missing_cols}"
                 )
                 return
 
             # 3. 数据清洗核心逻辑
-            df = self.raw_df.copy()
-
-            # 处理合并单元格：向下填充能源类型 (解决第0行是电，第1行NaN也是电的问题)
-            df["能源类型"] = df["能源类型"].ffill()
+            # 直接在原始数据上清洗，不再保留 raw_df，避免整表复制使峰值内存翻倍
+            df = self.raw_df
+            self.raw_df = None
 
-            # 去除空格
-            df["能源类型"] = df["能源类型"].astype(str).str.strip()
+            # 处理合并单元格：向下填充能源类型 (解决第0行是电，第1行NaN也是电的问题)，
+            # 并去除空格
+            df["能源类型"] = self._clean_energy_type(df["能源类型"])
 
             # Ensure '表号' is string to avoid Parquet mixed type issues
             if "表号" in df.columns:
@@ -92,30 +224,276 @@ class EnergySheet:
                 exc_info=True,
             )
 
+    @classmethod
+    def iter_workbook(cls, file_path, cache_dir=None):
+        """
+        逐个读取工作簿中的工作表 (生成器)。
+
+        只打开一次工作簿，避免为每个工作表重复解析整个 Excel 文件；
+        已缓存的工作表直接从缓存读取。按需逐个产出，调用方处理完
+        一个工作表后即可释放其数据，内存峰值只与单个工作表相关。
+
+        Args:
+            file_path (str): Excel 文件路径。
+            cache_dir (str | None): 缓存目录，为 None 时不使用原始数据缓存。
+
+        Yields:
+            tuple[str, pd.DataFrame]: (工作表名称, 原始数据)。
+        """
+        with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as xl:
+            for name in xl.sheet_names:
+                yield name, cls._load_raw_sheet(
+                    file_path,
+                    name,
+                    lambda name=name: xl.parse(name, **cls._read_options()),
+                    cache_dir,
+                )
+
+    @classmethod
+    def cache_schema(cls):
+        """
+        生成缓存格式标记。
+
+        包含缓存格式版本、读取的列和解析引擎，记录在文件指纹中；
+        任一变化时，未修改的文件也会重新处理，而不是继续使用旧缓存。
+
+        Returns:
+            str: 缓存格式标记。
+        """
+        return repr((cls.CACHE_VERSION, tuple(cls.READ_COLS), EXCEL_ENGINE))
+
+    @classmethod
+    def _read_options(cls):
+        """
+        读取工作表时的公共参数。
+
+        只解析 READ_COLS 中的列，减少解析器为无关单元格创建的对象；
+        使用函数形式的 usecols，缺少可选的 表号 列时不会报错。
+
+        Returns:
+            dict: 传给 pd.read_excel / ExcelFile.parse 的关键字参数。
+        """
+        return {
+            "usecols": lambda col: col in cls.READ_COLS,
+            "dtype": cls.READ_DTYPES,
+        }
+
+    @classmethod
+    def _get_raw_cache_path(cls, file_path, sheet_name, cache_dir):
+        """
+        生成原始工作表缓存路径。
+
+        文件名只由文件路径和工作表名决定，源文件修改后覆盖同一个缓存文件，
+        不会随修改次数不断累积。
+
+        Args:
+            file_path (str): Excel 文件路径。
+            sheet_name (str): 工作表名称。
+            cache_dir (str): 缓存目录。
+
+        Returns:
+            str: 缓存文件路径。
+        """
+        key = (os.path.abspath(file_path), sheet_name)
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(cache_dir, cls.RAW_CACHE_SUBDIR, f"{digest}.parquet")
+
+    @classmethod
+    def _raw_cache_key(cls, file_path):
+        """
+        生成原始工作表缓存的有效性标记。
+
+        包含文件修改时间和缓存格式标记 (见 cache_schema)，任一变化时缓存失效。
+
+        Args:
+            file_path (str): Excel 文件路径。
+
+        Returns:
+            bytes: 写入缓存文件元数据的标记。
+        """
+        key = (os.stat(file_path).st_mtime_ns, cls.cache_schema())
+        return repr(key).encode("utf-8")
+
+    @classmethod
+    def _load_raw_sheet(cls, file_path, sheet_name, parse, cache_dir=None):
+        """
+        读取原始工作表数据，优先使用 Parquet 缓存。
+
+        使用缓存时，命中与否返回的数据一致：解析结果同样经 Arrow 转换
+        (混合类型列转为字符串)，避免两次运行的清洗结果不同；
+        不使用缓存时直接返回解析结果。
+
+        Args:
+            file_path (str): Excel 文件路径。
+            sheet_name (str): 工作表名称。
+            parse (Callable[[], pd.DataFrame]): 缓存未命中时解析工作表的函数。
+            cache_dir (str | None): 缓存目录，为 None 时不使用缓存。
+
+        Returns:
+            pd.DataFrame: 原始工作表数据。
+        """
+        logger = logging.getLogger(__name__)
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = cls._get_raw_cache_path(file_path, sheet_name, cache_dir)
+            cache_key = cls._raw_cache_key(file_path)
+            if os.path.exists(cache_path):
+                try:
+                    table = pq.read_table(cache_path)
+                    metadata = table.schema.metadata or {}
+                    if metadata.get(cls.RAW_CACHE_KEY_FIELD) == cache_key:
+                        return table.to_pandas(**cls.TO_PANDAS_OPTIONS)
+                except Exception as e:
+                    logger.warning(f"读取原始数据缓存 {cache_path} 失败，重新解析: {e}")
+
+        if cache_path is None:
+            return parse()
+
+        raw_df = cls._to_arrow_safe(parse())
+        try:
+            table = pa.Table.from_pandas(raw_df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"工作表 {sheet_name} 无法转换为 Arrow 格式: {e}")
+            return raw_df
+        # 之后只保留 Arrow 表，避免解析结果、Arrow 表和转换结果三份数据同时存在
+        del raw_df
+
+        # 先写临时文件再原子替换，覆盖该工作表的旧缓存
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            metadata = dict(table.schema.metadata or {})
+            metadata[cls.RAW_CACHE_KEY_FIELD] = cache_key
+            pq.write_table(
+                table.replace_schema_metadata(metadata),
+                tmp_path,
+                **cls.PARQUET_WRITE_OPTIONS,
+            )
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"写入原始数据缓存 {cache_path} 失败: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return table.to_pandas(**cls.TO_PANDAS_OPTIONS)
+
+    def _read_raw(self):
+        """
+        读取当前工作表的原始数据，优先使用 Parquet 缓存。
+
+        Returns:
+            pd.DataFrame: 原始工作表数据。
+        """
+        return self._load_raw_sheet(
+            self.file_path,
+            self.sheet_name,
+            lambda: pd.read_excel(
+                self.file_path,
+                sheet_name=self.sheet_name,
+                engine=EXCEL_ENGINE,
+                **self._read_options(),
+            ),
+            self.cache_dir,
+        )
+
+    @staticmethod
+    def _to_arrow_safe(df):
+        """
+        将 Arrow 无法直接存储的混合类型列 (如数字与文本混杂的表号) 转为字符串。
+
+        空值保持不变，以便后续向下填充合并单元格。
+
+        Args:
+            df (pd.DataFrame): 原始数据。
+
+        Returns:
+            pd.DataFrame: 可写入 Parquet 的数据 (无需转换时返回原对象)。
+        """
+        result = df
+        for col in df.columns[df.dtypes == object]:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                if result is df:
+                    result = df.copy()
+                result[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return result
+
+    @staticmethod
+    def _clean_energy_type(series):
+        """
+        向下填充并去除能源类型列的空格。
+
+        文本列使用 PyArrow 计算内核一次完成填充、转换和去空格，
+        其他类型 (如混入数字) 回退到 pandas 的 ffill + astype(str) + strip。
+        首个能源类型之前的空行保持为空值。
+
+        Args:
+            series (pd.Series): 原始能源类型列。
+
+        Returns:
+            pd.Series: 清洗后的能源类型列。
+        """
+        try:
+            arr = pa.array(series, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr = None
+
+        if arr is None or not (
+            pa.types.is_string(arr.type)
+            or pa.types.is_large_string(arr.type)
+            or pa.types.is_null(arr.type)
+        ):
+            return series.ffill().astype(str).str.strip()
+
+        filled = pc.fill_null_forward(pc.cast(arr, pa.string()))
+        return pc.utf8_trim_whitespace(filled).to_pandas().set_axis(series.index)
+
     def _generate_summary(self):
         """
         生成分组汇总数据。
 
-        根据 TARGET_TYPES 筛选数据，并按能源类型对实际消耗和费用进行求和。
+        根据 TARGET_TYPES 筛选数据，并按能源类型对实际消耗和费用进行求和
+        (按 TARGET_TYPES 顺序输出，仅包含数据中出现的类型)。
         结果存储在 self.summary_df 中。
         """
         if self.processed_df is None:
             return
 
         df = self.processed_df
-        # 筛选目标类型并分组求和
-        grouped = (
-            df[df["能源类型"].isin(self.TARGET_TYPES)]
-            .groupby("能源类型")[["实际消耗", "费用(元)"]]
-            .sum()
-            .reset_index()
+        # 目标类型只有少数几种，按其在 TARGET_TYPES 中的位置编码后用 bincount 求和，
+        # 避免 groupby 的哈希分组开销 (非目标类型与空值的编码为 -1)
+        n_types = len(self.TARGET_TYPES)
+        codes = pd.Index(self.TARGET_TYPES).get_indexer(df["能源类型"])
+        valid = codes >= 0
+        target_codes = codes[valid]
+
+        def _sum_by_type(col):
+            weights = df.loc[valid, col].to_numpy(dtype=np.float64, na_value=0.0)
+            return np.bincount(target_codes, weights=weights, minlength=n_types)
+
+        usage = _sum_by_type("实际消耗")
+        cost = _sum_by_type("费用(元)")
+
+        # 仅保留实际出现的能源类型 (与分组求和的结果一致)
+        present = np.bincount(target_codes, minlength=n_types) > 0
+
+        # 一次性构建结果 (元数据列由标量广播)，避免逐列追加
+        self.summary_df = pd.DataFrame(
+            {
+                "能源类型": np.array(self.TARGET_TYPES)[present],
+                "实际消耗": usage[present],
+                "费用(元)": cost[present],
+                "日期区间": self.sheet_name,
+                "来源文件": self.file_name,
+            }
+        )
+        self._totals = dict(
+            zip(
+                self.summary_df["能源类型"],
+                zip(self.summary_df["实际消耗"], self.summary_df["费用(元)"]),
+            )
         )
-
-        # 添加元数据
-        grouped["日期区间"] = self.sheet_name
-        grouped["来源文件"] = self.file_name
-
-        self.summary_df = grouped
 
     def get_summary(self):
         """
@@ -126,6 +504,35 @@ class EnergySheet:
         """
         return self.summary_df
 
+    def get_summary_records(self):
+        """
+        以记录列表形式获取汇总数据。
+
+        便于调用方跨多个工作表累积后一次性构建 DataFrame，
+        避免对大量小 DataFrame 逐个 concat。
+
+        Returns:
+            list[dict]: 每个能源类型一条记录；无汇总数据时返回空列表。
+        """
+        if self.summary_df is None:
+            return []
+        return self.summary_df.to_dict("records")
+
+    def get_raw(self):
+        """
+        获取原始工作表数据。
+
+        原始数据在清洗后即被释放，此方法按需重新读取 (实例带有 cache_dir 时
+        通常命中原始数据缓存)。返回的是读取时按 READ_COLS 筛选过的列，
+        使用缓存时还经过 Arrow 规整 (混合类型列转为字符串)，并非工作表的全部内容。
+
+        Returns:
+            pd.DataFrame: 筛选后的原始工作表数据。
+        """
+        if self.raw_df is not None:
+            return self.raw_df
+        return self._read_raw()
+
     def get_details(self):
         """
         获取清洗后的详细数据。
@@ -145,44 +552,115 @@ class EnergySheet:
         Returns:
             tuple: (total_usage, total_cost)
         """
-        if self.summary_df is None:
-            return 0.0, 0.0
+        # 汇总时已建立查找表，未出现的能源类型返回 0
+        return self._totals.get(energy_type, (0.0, 0.0))
 
-        # 筛选对应能源类型的数据
-        result = self.summary_df[self.summary_df["能源类型"] == energy_type]
+    @staticmethod
+    def _cache_path_for(file_path, sheet_name, output_dir, format="feather"):
+        """
+        生成指定文件和工作表的缓存文件路径。
 
-        if result.empty:
-            return 0.0, 0.0
+        Args:
+            file_path (str): Excel 文件路径。
+            sheet_name (str): 工作表名称。
+            output_dir (str): 输出目录路径。
+            format (str): 文件格式后缀，默认为 "feather"。
 
-        # summary_df 已经是分组汇总过的，直接取第一行即可
-        return result["实际消耗"].iloc[0], result["费用(元)"].iloc[0]
+        Returns:
+            str: 完整的缓存文件路径。
+        """
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        # Clean sheet name to be filename safe
+        safe_sheet_name = safe_filename(sheet_name)
+        file_name = f"{base_name}_{safe_sheet_name}.{format}"
+        return os.path.join(output_dir, file_name)
 
-    def _get_cache_path(self, output_dir, format="parquet"):
+    def _get_cache_path(self, output_dir, format="feather"):
         """
         生成缓存文件路径。
 
         Args:
             output_dir (str): 输出目录路径。
-            format (str): 文件格式后缀，默认为 "parquet"。
+            format (str): 文件格式后缀，默认为 "feather"。
 
         Returns:
             str: 完整的缓存文件路径。
         """
-        base_name = os.path.splitext(self.file_name)[0]
-        # Clean sheet name to be filename safe
-        safe_sheet_name = "".join(
-            [c for c in self.sheet_name if c.isalnum() or c in (" ", ".", "-", "_")]
-        ).strip()
-        file_name = f"{base_name}_{safe_sheet_name}.{format}"
-        return os.path.join(output_dir, file_name)
+        return self._cache_path_for(self.file_path, self.sheet_name, output_dir, format)
 
-    def save_data(self, output_dir, format="parquet"):
+    @classmethod
+    def _read_cached_frame(cls, cache_path, format):
+        """
+        读取缓存的清洗后数据。
+
+        Args:
+            cache_path (str): 缓存文件路径。
+            format (str): 缓存文件格式，支持 'feather'、'parquet' 或 'csv'。
+
+        Returns:
+            pd.DataFrame | None: 缓存数据；格式不支持时返回 None。
+        """
+        if format == "feather":
+            return (
+                pa.ipc.open_file(cache_path)
+                .read_all()
+                .to_pandas(split_blocks=True, self_destruct=True)
+            )
+        if format == "parquet":
+            # 直接调用 pyarrow 读取，省去 pd.read_parquet 的包装开销
+            return pq.read_table(
+                cache_path, memory_map=True, pre_buffer=True, use_threads=True
+            ).to_pandas(split_blocks=True, self_destruct=True)
+        if format == "csv":
+            return pd.read_csv(cache_path)
+        return None
+
+    def _compute_digest(self):
+        """
+        计算清洗后数据的指纹 (每个实例只计算一次)。
+
+        安装了 xxhash 时使用 xxh3_64，否则使用 SHA-256；列名和数据类型一并计入，
+        以便发现结构变化。
+
+        Returns:
+            str: 十六进制指纹字符串。
+        """
+        if self._digest is None:
+            df = self.processed_df
+            hasher = _new_hasher()
+            hasher.update(repr(list(zip(df.columns, map(str, df.dtypes)))).encode())
+            hashed = pd.util.hash_pandas_object(df, index=False)
+            hasher.update(memoryview(hashed.to_numpy()))
+            self._digest = hasher.hexdigest()
+        return self._digest
+
+    def _write_digest(self, data_path):
+        """
+        将数据指纹写入 data_path 旁的 .digest 文件。
+
+        先写临时文件再原子替换，中断或并发写入时不会留下不完整的指纹。
+
+        Args:
+            data_path (str): 对应的缓存数据文件路径。
+        """
+        digest_path = data_path + self.DIGEST_SUFFIX
+        tmp_path = f"{digest_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self._compute_digest())
+            os.replace(tmp_path, digest_path)
+        except Exception as e:
+            self.logger.warning(f"写入数据指纹 {digest_path} 失败: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save_data(self, output_dir, format="feather"):
         """
         保存清洗后的详细数据到本地文件。
 
         Args:
             output_dir (str): 输出目录。
-            format (str): 保存格式，支持 'parquet' 或 'csv'。
+            format (str): 保存格式，支持 'feather' (默认)、'parquet' 或 'csv'。
 
         Returns:
             str | None: 成功保存的文件路径，失败则返回 None。
@@ -194,18 +672,25 @@ class EnergySheet:
         output_path = self._get_cache_path(output_dir, format)
 
         try:
-            if format == "parquet":
-                self.processed_df.to_parquet(output_path, index=False)
+            if format == "feather":
+                # 本地临时缓存，Feather (Arrow IPC) 读写均快于 Parquet
+                self.processed_df.to_feather(output_path, compression="lz4")
+            elif format == "parquet":
+                table = pa.Table.from_pandas(self.processed_df, preserve_index=False)
+                pq.write_table(table, output_path, **self.PARQUET_WRITE_OPTIONS)
             elif format == "csv":
                 self.processed_df.to_csv(output_path, index=False, encoding="utf-8-sig")
 
+            # 同时写入数据指纹，供 compare_with_cache 快速比对
+            self._write_digest(output_path)
+
             self.logger.info(f"已保存处理后的数据至 {output_path}")
             return output_path
         except Exception as e:
             self.logger.error(f"保存数据至 {output_path} 失败: {e}")
             return None
 
-    def compare_with_cache(self, output_dir, format="parquet"):
+    def compare_with_cache(self, output_dir, format="feather"):
         """
         与本地缓存数据进行比较，以检测数据是否发生变化。
 
@@ -227,18 +712,28 @@ class EnergySheet:
         if not os.path.exists(cache_path):
             return "NEW"
 
+        # 快速路径：指纹一致时无需读取并逐元素比较缓存文件
+        digest_path = cache_path + self.DIGEST_SUFFIX
         try:
-            if format == "parquet":
-                cached_df = pd.read_parquet(cache_path)
-            elif format == "csv":
-                cached_df = pd.read_csv(cache_path)
-            else:
+            if os.path.exists(digest_path):
+                with open(digest_path, "r", encoding="utf-8") as f:
+                    if f.read().strip() == self._compute_digest():
+                        return "MATCH"
+        except Exception as e:
+            self.logger.warning(f"读取数据指纹 {digest_path} 失败: {e}")
+
+        try:
+            cached_df = self._read_cached_frame(cache_path, format)
+            if cached_df is None:
                 return "ERROR"
 
             # 使用 pandas 的测试工具进行比较，忽略数据类型差异（如 int32 vs int64）
             pd.testing.assert_frame_equal(
                 self.processed_df, cached_df, check_dtype=False  # type: ignore
             )
+            # 能走到这里说明指纹缺失或已过期 (如切换了哈希算法)，
+            # 补写后下次即可走快速路径
+            self._write_digest(cache_path)
             return "MATCH"
         except AssertionError:
             return "MISMATCH"
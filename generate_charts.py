@@ -2,7 +2,7 @@
 图表生成模块
 ==========
 
-此脚本用于读取处理后的能源汇总数据 (Excel)，并生成可视化的统计图表。
+此脚本用于读取处理后的能源汇总数据 (Parquet)，并生成可视化的统计图表。
 生成的图表保存在 output/charts 目录下。
 
 包含的图表类型:
@@ -11,28 +11,46 @@
 3. 分组柱状图 (Grouped Bar Chart): 并排展示不同时间区间各能源类型的费用对比。
 """
 
+import functools
 import logging
 import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
-import pandas as pd
-from matplotlib.patches import Patch
-from matplotlib.ticker import FuncFormatter
+import matplotlib
+
+# 使用非交互式后端，避免每个工作进程初始化 GUI 后端
+# (图表均通过 Figure + FigureCanvasAgg 直接绘制，不经过 pyplot 的全局状态)
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+from matplotlib.patches import Patch  # noqa: E402
+from matplotlib.ticker import FuncFormatter  # noqa: E402
 
 try:
     import yaml
 except ImportError:  # pragma: no cover - PyYAML optional
     yaml = None
 
-from logging_config import setup_logger
+from energy_models import safe_filename  # noqa: E402
+from logging_config import setup_logger  # noqa: E402
+
+
+def configure_chart_fonts():
+    """Configure Chinese font support for Matplotlib in the current process."""
+
+    matplotlib.rcParams["font.sans-serif"] = [
+        "SimHei",
+        "Microsoft YaHei",
+        "Arial Unicode MS",
+    ]  # Windows/Mac compatible
+    matplotlib.rcParams["axes.unicode_minus"] = False
+
 
-# Configure Chinese font support for Matplotlib
-plt.rcParams["font.sans-serif"] = [
-    "SimHei",
-    "Microsoft YaHei",
-    "Arial Unicode MS",
-]  # Windows/Mac compatible
-plt.rcParams["axes.unicode_minus"] = False
+configure_chart_fonts()
 
 DEFAULT_ENERGY_COLOR_MAP = {
     "电": "#A8C8E1",
@@ -52,12 +70,14 @@ def load_energy_color_map(config_path: str = "config.yaml") -> dict:
         logging.getLogger(__name__).warning("未安装 PyYAML，使用默认配色")
         return colors
 
-    if not os.path.exists(config_path):
+    if not os.path.isfile(config_path):
         return colors
 
     try:
         with open(config_path, "r", encoding="utf-8") as cfg_file:
-            config = yaml.safe_load(cfg_file) or {}
+            # 优先使用 libyaml 的 C 解析器
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            config = yaml.load(cfg_file, Loader=loader) or {}
     except Exception as exc:  # pragma: no cover - defensive
         logging.getLogger(__name__).warning("读取配色配置失败，使用默认值: %s", exc)
         return colors
@@ -77,6 +97,17 @@ def load_energy_color_map(config_path: str = "config.yaml") -> dict:
 
 ENERGY_COLOR_MAP = load_energy_color_map()
 
+SUMMARY_FILE = "./output/energy_usage_summary.parquet"
+CHART_LOG_FILE = "./logs/charts.log"
+
+# PNG 输出参数：固定 DPI，并裁掉图表外多余的空白；
+# 图表仅供内部查看，使用最低的 zlib 压缩级别以缩短编码时间
+SAVEFIG_KWARGS = {
+    "dpi": 96,
+    "bbox_inches": "tight",
+    "pil_kwargs": {"compress_level": 1, "optimize": False},
+}
+
 
 def get_color_sequence(labels):
     """Return a color list aligned with known energy type order."""
@@ -93,176 +124,373 @@ def get_color_sequence(labels):
     return colors
 
 
-def generate_pie_charts():
+def _get_cost_columns(df):
+    """Return the per-energy cost columns (e.g. "电_费用(元)") in file order."""
+
+    return [col for col in df.columns if col.endswith("_费用(元)")]
+
+
+# 汇总数据及由费用列派生的信息，加载时计算一次，三个图表共享
+CostView = namedtuple("CostView", "df cost_cols energy_types rename_map")
+
+
+def _make_cost_view(df, cost_cols=None):
+    """
+    由汇总数据构建 CostView，一次性识别费用列并生成能源类型名称。
+
+    Args:
+        df (pd.DataFrame): 汇总数据。
+        cost_cols (list[str] | None): 费用列，为 None 时根据 df 识别。
+
+    Returns:
+        CostView: 汇总数据、费用列、能源类型数组及 费用列 -> 能源类型 的映射。
+    """
+    if cost_cols is None:
+        cost_cols = _get_cost_columns(df)
+    # Example: "电_费用(元)" -> "电"
+    energy_types = [col.replace("_费用(元)", "") for col in cost_cols]
+    return CostView(
+        df, cost_cols, np.array(energy_types), dict(zip(cost_cols, energy_types))
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_logger():
+    """
+    获取图表日志记录器，每个进程只初始化一次。
+
+    三个图表函数共用同一个日志文件，记忆化后重复调用不会再次配置处理器。
+
+    Returns:
+        logging.Logger: 配置好的日志记录器。
+    """
+    return setup_logger(log_level=logging.INFO, log_file=CHART_LOG_FILE)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_summary(input_file, mtime_ns):
+    """
+    读取汇总文件并缓存结果。
+
+    mtime_ns 只用作缓存键：汇总文件被重新生成后缓存自动失效。
+    返回的 CostView (含 DataFrame) 由所有调用方共享，不应原地修改。
+    """
+    return _make_cost_view(pq.read_table(input_file).to_pandas())
+
+
+def _load_summary(input_file=SUMMARY_FILE):
+    """
+    读取汇总数据并识别费用列。
+
+    三个图表函数共享同一份汇总数据：结果按文件修改时间缓存，
+    文件未变化时重复调用不会再次读取。
+
+    Args:
+        input_file (str): 汇总 Parquet 文件路径。
+
+    Returns:
+        CostView | None: 汇总数据视图；文件不存在时返回 None。
+    """
+    if not os.path.isfile(input_file):
+        logging.getLogger(__name__).error(f"未找到输入文件: {input_file}")
+        return None
+
+    return _read_summary(input_file, os.stat(input_file).st_mtime_ns)
+
+
+def _resolve_cost_view(df, cost_cols):
+    """
+    获取图表函数使用的 CostView：未传入数据时读取 (已缓存的) 汇总文件。
+
+    Args:
+        df (pd.DataFrame | None): 调用方传入的汇总数据。
+        cost_cols (list[str] | None): 调用方传入的费用列。
+
+    Returns:
+        CostView | None: 汇总数据视图；汇总文件不存在时返回 None。
+    """
+    if df is None:
+        return _load_summary()
+    return _make_cost_view(df, cost_cols)
+
+
+def _build_plot_df(view):
+    """
+    构建柱状图所用的数据：日期区间为索引，能源类型为列，剔除总费用为 0 的区间。
+
+    堆叠柱状图与分组柱状图的数据准备完全一致，可共享同一结果。
+    """
+    plot_df = view.df.set_index("日期区间")[view.cost_cols].rename(
+        columns=view.rename_map
+    )
+
+    # Filter out rows with 0 total cost
+    return plot_df[plot_df.sum(axis=1) > 0]
+
+
+def _format_bar_labels(heights, threshold):
+    """
+    按列预先生成柱状图数值标签，格式如 "12,345"，不超过阈值的柱子留空。
+
+    Args:
+        heights (np.ndarray): 柱高矩阵，行对应日期区间，列对应能源类型
+            (与 ax.containers 的顺序一致)。
+        threshold (float): 显示标签的最小柱高 (不含)。
+
+    Returns:
+        list[list[str]]: 每列 (每个 BarContainer) 的标签列表。
+    """
+    heights = np.asarray(heights, dtype=np.float64)
+    mask = heights > threshold
+    return [
+        [f"{height:,.0f}" if keep else "" for height, keep in zip(col, keep_col)]
+        for col, keep_col in zip(heights.T.tolist(), mask.T.tolist())
+    ]
+
+
+def _extract_positive(cost_matrix):
+    """
+    一次性提取费用矩阵中每行大于 0 的费用，生成不规则 (ragged) 结构。
+
+    Args:
+        cost_matrix (np.ndarray): 费用矩阵，行对应日期区间，列对应能源类型。
+
+    Returns:
+        tuple: (values, col_idx, offsets)。第 i 行的正费用为
+            values[offsets[i]:offsets[i + 1]]，对应的列下标在 col_idx 的同一区间。
+    """
+    mask = cost_matrix > 0
+    # 布尔索引与 nonzero 均按行优先顺序展开，两者一一对应
+    values = cost_matrix[mask]
+    _, col_idx = np.nonzero(mask)
+    offsets = np.zeros(cost_matrix.shape[0] + 1, dtype=np.intp)
+    np.cumsum(mask.sum(axis=1), out=offsets[1:])
+    return values, col_idx, offsets
+
+
+def _render_pie(
+    canvas, ax, total_text, fit_layout, date_range, labels, values, output_dir
+):
+    """
+    在复用的画布上渲染并保存单个日期区间的费用分布饼图。
+
+    Args:
+        canvas (FigureCanvasAgg): 复用画布 (其 figure 属性为复用的 Figure)。
+        ax (matplotlib.axes.Axes): 复用的坐标轴，绘制前会被清空。
+        total_text (matplotlib.text.Text): 复用的底部总费用文本。
+        fit_layout (bool): 是否重新计算 tight_layout。所有饼图布局相同，
+            只需在第一张图上计算，之后沿用画布上已有的子图参数。
+        date_range (str): 日期区间。
+        labels (list[str]): 能源类型名称。
+        values (list[float]): 对应的费用 (均大于 0)。
+        output_dir (str): 图表输出目录。
+
+    Returns:
+        str: 生成的图片路径。
+    """
+    # Reset the reused canvas; the figure-level total text is updated in place
+    fig = canvas.figure
+    ax.clear()
+
+    total_cost = sum(values)
+
+    # Pie chart
+    # We use a legend to avoid label overlap on the chart itself
+    pie_colors = get_color_sequence(labels)
+    wedges, texts, autotexts = ax.pie(  # type: ignore
+        values,
+        colors=pie_colors,
+        autopct="%1.1f%%",
+        startangle=140,
+        pctdistance=0.75,
+        textprops={"fontsize": 18},
+        wedgeprops={"rasterized": True},
+    )
+
+    ax.set_title(
+        f"能源费用分布 - {date_range}", fontsize=28, pad=20
+    )  # Increased title font size
+    ax.axis("equal")  # Equal aspect ratio ensures that pie is drawn as a circle.
+
+    # Create detailed legend labels
+    legend_labels = [f"{label}: {val:,.2f}元" for label, val in zip(labels, values)]
+
+    # Add legend to the right
+    ax.legend(
+        wedges,
+        legend_labels,
+        title="分项费用明细",
+        loc="center left",
+        bbox_to_anchor=(0.9, 0, 0.5, 1),
+        fontsize=30,
+        title_fontsize=30,
+    )
+
+    # Total cost at the bottom
+    total_text.set_text(f"总费用: {total_cost:,.2f} 元")
+
+    # Adjust layout to make room for legend and bottom text
+    # rect=[left, bottom, right, top]
+    # (ax.clear() 不会重置子图位置，后续饼图直接复用第一次的布局结果)
+    if fit_layout:
+        fig.tight_layout(rect=(0, 0.1, 0.85, 0.95))
+
+    # Save chart
+    # Clean filename
+    safe_date_range = safe_filename(date_range)
+    output_path = os.path.join(output_dir, f"cost_distribution_{safe_date_range}.png")
+
+    canvas.print_figure(output_path, **SAVEFIG_KWARGS)
+
+    return output_path
+
+
+def _render_pie_batch(tasks):
+    """
+    在同一个画布上依次渲染一批饼图，作为进程池的工作函数。
+
+    每个任务只包含基本类型 (date_range, labels, values, output_dir)。
+    整批复用一个 Figure，避免每张图重复创建画布和解析字体。
+
+    Args:
+        tasks (list[tuple]): 渲染任务列表。
+
+    Returns:
+        list[str]: 生成的图片路径。
+    """
+    # Large canvas keeps legend readable
+    fig = Figure(figsize=(16, 10))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+
+    # Tracked handle for the total cost text, reused across the batch
+    total_text = fig.text(
+        0.5,
+        0.05,
+        "",
+        ha="center",
+        fontsize=26,
+        fontweight="bold",
+        color="#333333",
+    )
+
+    # Warm up the font cache once for the whole batch
+    canvas.draw()
+    return [
+        _render_pie(canvas, ax, total_text, i == 0, *task)
+        for i, task in enumerate(tasks)
+    ]
+
+
+def generate_pie_charts(df=None, cost_cols=None):
     """
     生成费用分布饼图。
 
     遍历汇总数据中的每一行 (每个日期区间)，为每个区间生成一个饼图，
     显示不同能源类型的费用占比。
 
+    Args:
+        df (pd.DataFrame | None): 汇总数据，为 None 时从汇总文件读取。
+        cost_cols (list[str] | None): 费用列，为 None 时根据 df 识别。
+
     输出:
         在 output/charts 目录下生成 cost_distribution_{日期区间}.png
     """
     # Setup logging
-    logger = setup_logger(log_level=logging.INFO, log_file="./logs/charts.log")
+    logger = _get_logger()
 
-    input_file = "./output/energy_usage_summary.xlsx"
     output_dir = "./output/charts"
 
-    if not os.path.exists(input_file):
-        logger.error(f"未找到输入文件: {input_file}")
-        return
-
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
     try:
-        df = pd.read_excel(input_file)
+        view = _resolve_cost_view(df, cost_cols)
+        if view is None:
+            return
 
-        # Identify cost columns
-        cost_cols = [col for col in df.columns if col.endswith("_费用(元)")]
+        os.makedirs(output_dir, exist_ok=True)
 
-        if not cost_cols:
+        if not view.cost_cols:
             logger.warning("未找到费用列。")
             return
 
-        for index, row in df.iterrows():
-            date_range = row["日期区间"]
+        # Extract the cost block once as NumPy arrays instead of iterrows()
+        cost_matrix = view.df[view.cost_cols].to_numpy(dtype=np.float64)
+        date_ranges = view.df["日期区间"].to_numpy()
+        energy_types = view.energy_types
 
-            # Extract data for this row
-            values = []
-            labels = []
+        # 整个矩阵只做一次正值筛选，循环内按偏移量切片
+        pos_values, pos_cols, offsets = _extract_positive(cost_matrix)
 
-            for col in cost_cols:
-                val = row[col]
-                if val > 0:
-                    values.append(val)
-                    # Example: "电_费用(元)" -> "电"
-                    energy_type = col.replace("_费用(元)", "")
-                    labels.append(energy_type)
+        # 先收集渲染任务，只向子进程传递字符串和列表，避免序列化 DataFrame
+        tasks = []
+        for i, date_range in enumerate(date_ranges):
+            # Extract data for this row
+            start, end = offsets[i], offsets[i + 1]
+            values = pos_values[start:end].tolist()
+            labels = energy_types[pos_cols[start:end]].tolist()
 
             if not values:
                 logger.info(f"{date_range} 无费用数据，跳过图表生成。")
                 continue
 
-            total_cost = sum(values)
-
-            # Create Pie Chart
-            # Large canvas keeps legend readable
-            plt.figure(figsize=(16, 10))
-
-            # Pie chart
-            # We use a legend to avoid label overlap on the chart itself
-            pie_colors = get_color_sequence(labels)
-            wedges, texts, autotexts = plt.pie(  # type: ignore
-                values,
-                colors=pie_colors,
-                autopct="%1.1f%%",
-                startangle=140,
-                pctdistance=0.75,
-                textprops={"fontsize": 18},
-            )
-
-            plt.title(
-                f"能源费用分布 - {date_range}", fontsize=28, pad=20
-            )  # Increased title font size
-            plt.axis(
-                "equal"
-            )  # Equal aspect ratio ensures that pie is drawn as a circle.
-
-            # Create detailed legend labels
-            legend_labels = [
-                f"{label}: {val:,.2f}元" for label, val in zip(labels, values)
-            ]
-
-            # Add legend to the right
-            plt.legend(
-                wedges,
-                legend_labels,
-                title="分项费用明细",
-                loc="center left",
-                bbox_to_anchor=(0.9, 0, 0.5, 1),
-                fontsize=30,
-                title_fontsize=30,
-            )
-
-            # Add total cost at the bottom
-            plt.figtext(
-                0.5,
-                0.05,
-                f"总费用: {total_cost:,.2f} 元",
-                ha="center",
-                fontsize=26,
-                fontweight="bold",
-                color="#333333",
-            )
+            tasks.append((str(date_range), labels, values, output_dir))
 
-            # Adjust layout to make room for legend and bottom text
-            # rect=[left, bottom, right, top]
-            plt.tight_layout(rect=(0, 0.1, 0.85, 0.95))
-
-            # Save chart
-            # Clean filename
-            allowed_chars = {" ", ".", "-", "_"}
-            clean_chars = [
-                c for c in str(date_range) if c.isalnum() or c in allowed_chars
-            ]
-            safe_date_range = "".join(clean_chars).strip()
-            output_path = os.path.join(
-                output_dir, f"cost_distribution_{safe_date_range}.png"
-            )
-
-            plt.savefig(output_path)
-            plt.close()
+        if not tasks:
+            return
 
-            logger.info(f"已生成图表: {output_path}")
-            print(f"已生成图表: {output_path}")
+        # 每个饼图相互独立且为 CPU 密集型，使用多进程并行渲染；
+        # 任务按进程分批，每个进程只创建一个画布
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        batches = [tasks[i::max_workers] for i in range(max_workers)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for output_paths in executor.map(_render_pie_batch, batches):
+                for output_path in output_paths:
+                    logger.info(f"已生成图表: {output_path}")
+                    print(f"已生成图表: {output_path}")
 
     except Exception as e:
         logger.error(f"生成图表失败: {e}", exc_info=True)
 
 
-def generate_cost_bar_chart():
+def generate_cost_bar_chart(df=None, cost_cols=None, plot_df=None):
     """
     生成费用对比堆叠柱状图。
 
     以日期区间为 X 轴，费用为 Y 轴，展示各区间的总费用。
     不同能源类型的费用在柱状图中堆叠显示，方便比较总费用及构成。
 
+    Args:
+        df (pd.DataFrame | None): 汇总数据，为 None 时从汇总文件读取。
+        cost_cols (list[str] | None): 费用列，为 None 时根据 df 识别。
+        plot_df (pd.DataFrame | None): 预先构建的绘图数据 (见 _build_plot_df)，
+            提供时直接使用，忽略 df 与 cost_cols。
+
     输出:
         output/charts/cost_comparison_bar.png
     """
-    logger = setup_logger(log_level=logging.INFO, log_file="./logs/charts.log")
-    input_file = "./output/energy_usage_summary.xlsx"
+    logger = _get_logger()
     output_dir = "./output/charts"
 
-    if not os.path.exists(input_file):
-        logger.error(f"未找到输入文件: {input_file}")
-        return
-
     try:
-        df = pd.read_excel(input_file)
-
-        # Filter cost columns
-        cost_cols = [col for col in df.columns if col.endswith("_费用(元)")]
-        if not cost_cols:
-            logger.warning("未找到用于柱状图的费用列。")
-            return
+        if plot_df is None:
+            view = _resolve_cost_view(df, cost_cols)
+            if view is None:
+                return
 
-        # Prepare data: Date Range as index, Columns as Energy Types
-        rename_map = {col: col.replace("_费用(元)", "") for col in cost_cols}
-        plot_df = df.set_index("日期区间")[cost_cols].rename(columns=rename_map)
+            if not view.cost_cols:
+                logger.warning("未找到用于柱状图的费用列。")
+                return
 
-        # Filter out rows with 0 total cost
-        plot_df = plot_df[plot_df.sum(axis=1) > 0]
+            # Prepare data: Date Range as index, Columns as Energy Types
+            plot_df = _build_plot_df(view)
 
         if plot_df.empty:
             logger.info("无有效的柱状图数据。")
             return
 
         # Create figure
-        plt.figure(figsize=(18, 12))
-        ax = plt.gca()
+        fig = Figure(figsize=(18, 12))
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
 
         # Plot stacked bar chart with shared color palette
         bar_colors = get_color_sequence(plot_df.columns.tolist())
@@ -273,20 +501,21 @@ def generate_cost_bar_chart():
             width=0.6,
             alpha=0.9,
             color=bar_colors,
+            rasterized=True,
         )
 
         # Styling
-        plt.title("各区间能源费用对比", fontsize=30, pad=25)
-        plt.xlabel("日期区间", fontsize=24, labelpad=15)
-        plt.ylabel("费用 (万元)", fontsize=24, labelpad=15)
+        ax.set_title("各区间能源费用对比", fontsize=30, pad=25)
+        ax.set_xlabel("日期区间", fontsize=24, labelpad=15)
+        ax.set_ylabel("费用 (万元)", fontsize=24, labelpad=15)
         ax.yaxis.set_major_formatter(
             FuncFormatter(lambda value, _: f"{value / 10000:.1f}")
         )
-        plt.xticks(rotation=0, fontsize=20)
-        plt.yticks(fontsize=20)
+        ax.tick_params(axis="x", labelrotation=0, labelsize=20)
+        ax.tick_params(axis="y", labelsize=20)
 
         # Legend
-        plt.legend(
+        ax.legend(
             title="能源类型",
             fontsize=18,
             title_fontsize=20,
@@ -295,8 +524,9 @@ def generate_cost_bar_chart():
         )
 
         # Add total labels on top of bars
-        totals = plot_df.sum(axis=1)
-        for i, total in enumerate(totals):
+        heights = plot_df.to_numpy(dtype=np.float64)
+        totals = heights.sum(axis=1)
+        for i, total in enumerate(totals.tolist()):
             ax.text(
                 i,
                 total,
@@ -308,16 +538,10 @@ def generate_cost_bar_chart():
             )
 
         # Add value labels inside bars (only for significant values)
-        for c in ax.containers:
-            # Create labels
-            labels = []
-            for v in c:
-                height = v.get_height()
-                # Only label if height is > 5% of max total to avoid clutter
-                if height > totals.max() * 0.05:
-                    labels.append(f"{height:,.0f}")
-                else:
-                    labels.append("")
+        # Only label if height is > 5% of max total to avoid clutter
+        threshold = totals.max() * 0.05
+        column_labels = _format_bar_labels(heights, threshold)
+        for c, labels in zip(ax.containers, column_labels):
             ax.bar_label(
                 c,  # type: ignore
                 labels=labels,
@@ -327,11 +551,11 @@ def generate_cost_bar_chart():
                 fontweight="bold",
             )
 
-        plt.tight_layout()
+        fig.tight_layout()
 
+        os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, "cost_comparison_bar.png")
-        plt.savefig(output_path)
-        plt.close()
+        canvas.print_figure(output_path, **SAVEFIG_KWARGS)
 
         logger.info(f"已生成柱状图: {output_path}")
         print(f"已生成柱状图: {output_path}")
@@ -340,7 +564,7 @@ def generate_cost_bar_chart():
         logger.error(f"生成柱状图失败: {e}", exc_info=True)
 
 
-def generate_grouped_bar_chart():
+def generate_grouped_bar_chart(df=None, cost_cols=None, plot_df=None):
     """
     生成分项费用对比分组柱状图。
 
@@ -349,39 +573,39 @@ def generate_grouped_bar_chart():
     - 布局：图例在底部，X轴标签旋转45度。
     - 样式：清晰的背景，数据标签横向显示，字体放大。
 
+    Args:
+        df (pd.DataFrame | None): 汇总数据，为 None 时从汇总文件读取。
+        cost_cols (list[str] | None): 费用列，为 None 时根据 df 识别。
+        plot_df (pd.DataFrame | None): 预先构建的绘图数据 (见 _build_plot_df)，
+            提供时直接使用，忽略 df 与 cost_cols。
+
     输出:
         output/charts/cost_grouped_bar.png
     """
-    logger = setup_logger(log_level=logging.INFO, log_file="./logs/charts.log")
-    input_file = "./output/energy_usage_summary.xlsx"
+    logger = _get_logger()
     output_dir = "./output/charts"
 
-    if not os.path.exists(input_file):
-        logger.error(f"未找到输入文件: {input_file}")
-        return
-
     try:
-        df = pd.read_excel(input_file)
+        if plot_df is None:
+            view = _resolve_cost_view(df, cost_cols)
+            if view is None:
+                return
 
-        # Filter cost columns
-        cost_cols = [col for col in df.columns if col.endswith("_费用(元)")]
-        if not cost_cols:
-            logger.warning("未找到用于分组柱状图的费用列。")
-            return
-
-        # Prepare data: Date Range as index, Columns as Energy Types
-        rename_map = {col: col.replace("_费用(元)", "") for col in cost_cols}
-        plot_df = df.set_index("日期区间")[cost_cols].rename(columns=rename_map)
+            if not view.cost_cols:
+                logger.warning("未找到用于分组柱状图的费用列。")
+                return
 
-        # Filter out rows with 0 total cost
-        plot_df = plot_df[plot_df.sum(axis=1) > 0]
+            # Prepare data: Date Range as index, Columns as Energy Types
+            plot_df = _build_plot_df(view)
 
         if plot_df.empty:
             logger.info("无有效的分组柱状图数据。")
             return
 
         # Create figure and primary axis
-        fig, ax1 = plt.subplots(figsize=(20, 12))
+        fig = Figure(figsize=(20, 12))
+        canvas = FigureCanvasAgg(fig)
+        ax1 = fig.add_subplot(111)
 
         # Plot grouped bars on ax1 with consistent palette
         group_colors = get_color_sequence(plot_df.columns.tolist())
@@ -393,6 +617,7 @@ def generate_grouped_bar_chart():
             rot=0,
             color=group_colors,
             legend=False,
+            rasterized=True,
         )
 
         # Styling
@@ -431,18 +656,11 @@ def generate_grouped_bar_chart():
         )
 
         # Adjust layout to make room for legend and rotated labels
-        plt.subplots_adjust(bottom=0.2, top=0.9)
+        fig.subplots_adjust(bottom=0.2, top=0.9)
 
         # Add value labels on top of each bar (ax1)
-        for c in ax1.containers:
-            labels = []
-            for v in c:
-                height = v.get_height()
-                if height > 0:
-                    labels.append(f"{height:,.0f}")
-                else:
-                    labels.append("")
-
+        column_labels = _format_bar_labels(plot_df.to_numpy(dtype=np.float64), 0)
+        for c, labels in zip(ax1.containers, column_labels):
             ax1.bar_label(
                 c,
                 labels=labels,
@@ -452,9 +670,9 @@ def generate_grouped_bar_chart():
                 rotation=0,  # Horizontal labels
             )
 
+        os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, "cost_grouped_bar.png")
-        plt.savefig(output_path)
-        plt.close()
+        canvas.print_figure(output_path, **SAVEFIG_KWARGS)
 
         logger.info(f"已生成分组柱状图: {output_path}")
         print(f"已生成分组柱状图: {output_path}")
@@ -464,6 +682,14 @@ def generate_grouped_bar_chart():
 
 
 if __name__ == "__main__":
-    generate_pie_charts()
-    generate_cost_bar_chart()
-    generate_grouped_bar_chart()
+    _get_logger()
+
+    # 只读取一次汇总数据，三个图表共享 (_load_summary 的结果已缓存)
+    summary_view = _load_summary()
+    if summary_view is not None:
+        summary_plot_df = (
+            _build_plot_df(summary_view) if summary_view.cost_cols else None
+        )
+        generate_pie_charts()
+        generate_cost_bar_chart(plot_df=summary_plot_df)
+        generate_grouped_bar_chart(plot_df=summary_plot_df)
@@ -8,16 +8,24 @@ Excel 文件检查工具
 功能:
 1. 列出 input 目录下的 Excel 文件。
 2. 读取第一个文件的所有 Sheet 名称。
-3. 读取第一个 Sheet 的前几行数据并打印，用于检查数据清洗前的原始状态。
+3. 读取第一个 Sheet 的前几行数据 (最多 PREVIEW_ROWS 行) 并打印，
+   用于检查数据清洗前的原始状态。
 """
 
 import pandas as pd
 import os
 
+from energy_models import EXCEL_ENGINE
+
 input_dir = "./input"
-files = [
-    f for f in os.listdir(input_dir) if f.endswith(".xlsx") and not f.startswith("~$")
-]
+# 只预览表头和前若干行，无需解析整张工作表
+PREVIEW_ROWS = 50
+with os.scandir(input_dir) as entries:
+    files = [
+        e.name
+        for e in entries
+        if e.is_file() and e.name.endswith(".xlsx") and not e.name.startswith("~$")
+    ]
 
 if not files:
     print("No Excel files found.")
@@ -26,19 +34,20 @@ else:
     print(f"Inspecting file: {file_path}")
 
     try:
-        # Read all sheet names
-        xls = pd.ExcelFile(file_path)
-        print(f"Sheet names: {xls.sheet_names}")
+        # Open the workbook once and reuse it for the preview
+        with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as xls:
+            # Read all sheet names
+            print(f"Sheet names: {xls.sheet_names}")
 
-        # Read first sheet
-        df = pd.read_excel(file_path, sheet_name=0)
+            # Read header + first rows of the first sheet
+            df = xls.parse(sheet_name=0, nrows=PREVIEW_ROWS)
 
         # Forward fill '能源类型' to handle merged cells
         df["能源类型"] = df["能源类型"].ffill()
 
         print("\nFirst Sheet Columns:")
         print(df.columns.tolist())
-        print("\nAll rows:")
+        print(f"\nFirst {PREVIEW_ROWS} rows:")
         print(df.to_string())
 
     except Exception as e:
@@ -41,6 +41,14 @@ def setup_logger(
     app_logger = logging.getLogger()
     app_logger.setLevel(log_level)
 
+    # 已经在写同一个日志文件时直接复用，避免重复截断 (如多进程共享的日志文件)
+    log_path = os.path.abspath(log_file)
+    if any(
+        isinstance(handler, logging.FileHandler) and handler.baseFilename == log_path
+        for handler in app_logger.handlers
+    ):
+        return app_logger
+
     # 清除已有的处理器，避免重复添加
     if app_logger.handlers:
         app_logger.handlers.clear()
@@ -12,15 +12,29 @@
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from logging_config import setup_logger
 from process_energy_data import process_excel_files
 from generate_charts import (
+    CHART_LOG_FILE,
+    configure_chart_fonts,
     generate_pie_charts,
     generate_cost_bar_chart,
     generate_grouped_bar_chart,
 )
 
 
+def _init_chart_worker():
+    """
+    图表子进程初始化：追加写入共享的图表日志，并重新设置中文字体。
+
+    Matplotlib 与日志配置均为进程级状态，子进程需要各自设置。
+    """
+    setup_logger(log_level=logging.INFO, log_file=CHART_LOG_FILE, filemode="a")
+    configure_chart_fonts()
+
+
 def main():
     """
     执行完整的工作流：
@@ -41,9 +55,23 @@ def main():
         # 2. 生成图表
         logger.info(">>> 阶段 2: 生成统计图表...")
         print("正在生成统计图表...")
-        generate_pie_charts()
-        generate_cost_bar_chart()
-        generate_grouped_bar_chart()
+        # 三类图表相互独立且渲染为 CPU 密集型，使用多进程并行生成
+        chart_funcs = [
+            generate_pie_charts,
+            generate_cost_bar_chart,
+            generate_grouped_bar_chart,
+        ]
+        # 图表日志由多个进程共享：先清空，再让所有进程以追加模式写入
+        with open(CHART_LOG_FILE, "w", encoding="utf-8"):
+            pass
+        setup_logger(log_level=logging.INFO, log_file=CHART_LOG_FILE, filemode="a")
+        max_workers = min(len(chart_funcs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_chart_worker
+        ) as executor:
+            futures = [executor.submit(func) for func in chart_funcs]
+            for future in as_completed(futures):
+                future.result()
         logger.info("图表生成完成。")
 
         logger.info("工作流执行成功！所有结果已保存至 output 目录。")
@@ -5,20 +5,42 @@
 此脚本负责协调整个能源数据的处理流程。主要功能包括：
 1. 读取配置文件 (config.yaml)。
 2. 扫描输入目录中的 Excel 文件。
-3. 使用 EnergySheet 类处理每个工作表的数据。
-4. 管理数据缓存 (Parquet 格式)，避免重复处理并检查数据一致性。
-5. 生成汇总 Excel 报表，包含各能源类型的费用统计。
+3. 使用 EnergySheet 类处理每个工作表的数据 (各文件在多个进程中并行处理)。
+4. 管理数据缓存 (Feather 格式)，避免重复处理并检查数据一致性；
+   源文件未变化时 (按文件指纹判断) 直接使用缓存，不再解析 Excel。
+5. 生成汇总 Excel 报表 (及同内容的 CSV)，包含各能源类型的费用统计。
+6. 同时输出 Parquet 格式的汇总文件，供图表生成模块快速读取。
 
 使用方法:
     直接运行此脚本: python process_energy_data.py
 """
 
+import functools
+import json
 import os
-import yaml
-import pandas as pd
 import logging
+import logging.handlers
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from logging_config import setup_logger
-from energy_models import EnergySheet
+
+# pandas / numpy / yaml / energy_models 导入开销较大，推迟到实际使用的函数内导入：
+# 仅导入本模块 (如 main.py、进程池子进程反序列化任务函数) 时无需付出该开销
+
+try:
+    import xlsxwriter  # noqa: F401
+
+    # xlsxwriter 的 constant_memory 模式逐行写出，不在内存中构建整张表的 XML；
+    # 日期区间等文本列保持为文本，不尝试转换为数字
+    XLSX_WRITER_KWARGS = {
+        "engine": "xlsxwriter",
+        "engine_kwargs": {
+            "options": {"constant_memory": True, "strings_to_numbers": False}
+        },
+    }
+except ImportError:  # pragma: no cover - xlsxwriter optional
+    XLSX_WRITER_KWARGS = {"engine": "openpyxl"}
 
 
 def load_config(config_path="config.yaml"):
@@ -31,8 +53,276 @@ def load_config(config_path="config.yaml"):
     Returns:
         dict: 包含配置信息的字典。
     """
+    import yaml
+
+    # 优先使用 libyaml 实现的 C 解析器，未编译 libyaml 时回退到纯 Python 实现
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=loader)
+
+
+# 读取同一文件各工作表缓存时的最大线程数
+CACHE_READ_THREADS = 8
+
+# 文件指纹记录 (位于缓存目录)：文件名 -> 修改时间、大小、缓存格式标记、
+# 数据工作表列表及跳过的非数据工作表列表
+FINGERPRINT_FILE = "_fingerprints.json"
+
+# 配置文件 log_level 接受的取值
+_LEVELS = {
+    n: getattr(logging, n) for n in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+
+# 汇总表中能源类型列的目标顺序
+TARGET_ORDER = ("电", "采暖热表", "生活热水表", "自来水", "中水", "燃气")
+
+
+def _file_fingerprint(entry, schema):
+    """
+    获取文件指纹 (修改时间、大小及缓存格式标记)。
+
+    Args:
+        entry (os.DirEntry): os.scandir 返回的目录项，其 stat 结果会被缓存
+            (Windows 上直接来自目录枚举，无需额外的系统调用)。
+        schema (str): 缓存格式标记 (见 EnergySheet.cache_schema)，
+            升级后读取的列或清洗逻辑变化时，旧指纹随之失效。
+
+    Returns:
+        dict: {"mtime_ns": int, "size": int, "schema": str}。
+    """
+    st = entry.stat()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "schema": schema}
+
+
+def _load_fingerprints(cache_dir):
+    """
+    读取上次运行记录的文件指纹。
+
+    Args:
+        cache_dir (str): 缓存目录。
+
+    Returns:
+        dict: 文件名到指纹记录的映射；文件不存在或损坏时返回空字典。
+    """
+    path = os.path.join(cache_dir, FINGERPRINT_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"读取文件指纹 {path} 失败: {e}")
+        return {}
+
+
+def _save_fingerprints(cache_dir, fingerprints):
+    """
+    保存文件指纹记录 (先写临时文件再原子替换)。
+
+    Args:
+        cache_dir (str): 缓存目录。
+        fingerprints (dict): 文件名到指纹记录的映射。
+    """
+    path = os.path.join(cache_dir, FINGERPRINT_FILE)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fingerprints, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"保存文件指纹 {path} 失败: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def _column_layout(observed_types, target_order=TARGET_ORDER):
+    """
+    计算汇总表的能源类型顺序及对应的列名。
+
+    目标顺序是固定配置，实际出现的类型组合也只有少数几种，按组合缓存结果，
+    同一进程内再次汇总时无需重新排序和拼接列名。
+
+    Args:
+        observed_types (frozenset): 数据中实际出现的能源类型。
+        target_order (tuple): 能源类型的目标顺序。
+
+    Returns:
+        tuple: (type_labels, cost_columns)。不在目标顺序中的类型按名称排在最后。
+    """
+    type_labels = tuple(t for t in target_order if t in observed_types) + tuple(
+        sorted(observed_types - set(target_order))
+    )
+    return type_labels, tuple(f"{t}_费用(元)" for t in type_labels)
+
+
+def _init_worker(log_queue, log_level):
+    """
+    文件处理子进程初始化：将日志统一发送到主进程的日志队列。
+
+    子进程不直接写日志文件，由主进程的 QueueListener 统一输出，
+    避免多个进程同时写入同一个文件导致日志行交错。
+
+    Args:
+        log_queue (multiprocessing.Queue): 主进程的日志队列。
+        log_level (int): 日志级别。
+    """
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(log_level)
+
+
+def _check_sheet(sheet_obj, cache_dir):
+    """
+    将工作表与缓存比对，新工作表写入缓存，并记录比对结果。
+
+    Args:
+        sheet_obj (EnergySheet): 已完成清洗的工作表。
+        cache_dir (str): 工作表缓存目录。
+
+    Returns:
+        bool: 工作表与缓存一致 (或已成功保存为新缓存) 时为 True。
+    """
+    logger = logging.getLogger(__name__)
+    sheet_name = sheet_obj.sheet_name
+
+    # Compare with cache and save if new
+    comparison_result = sheet_obj.compare_with_cache(cache_dir, format="feather")
+
+    if comparison_result == "NEW":
+        logger.info(f"检测到新工作表: {sheet_name}。正在保存到缓存。")
+        return sheet_obj.save_data(cache_dir, format="feather") is not None
+    if comparison_result == "MATCH":
+        logger.info(f"工作表 {sheet_name} 数据一致性检查通过。")
+        return True
+    if comparison_result == "MISMATCH":
+        logger.error(
+            f"文件 {sheet_obj.file_name} 中的工作表 {sheet_name} "
+            "与缓存数据不匹配！跳过缓存更新。"
+        )
+    else:
+        logger.error(f"检查工作表 {sheet_name} 的缓存时出错。")
+    return False
+
+
+def _load_cached_file(file_path, cache_dir, sheet_names, skipped=()):
+    """
+    源文件未变化时，直接由各工作表的缓存生成汇总记录，不打开 Excel 文件。
+
+    各工作表的缓存读取互不依赖，使用线程池并发读取 (Arrow 读取时会释放 GIL)，
+    使多个小文件的 I/O 相互重叠，而不是逐个阻塞等待。
+    个别工作表缓存缺失时，只重新读取这些工作表。
+
+    Args:
+        file_path (str): Excel 文件路径。
+        cache_dir (str): 工作表缓存目录。
+        sheet_names (list[str]): 上次运行记录的工作表列表。
+        skipped (Iterable[str]): 上次运行因缺少必需列而跳过的工作表，不读取。
+
+    Returns:
+        tuple: (summary_records, consistent)。consistent 表示所有工作表
+            均来自缓存或已与缓存比对一致。
+    """
+    from energy_models import EnergySheet
+
+    logger = logging.getLogger(__name__)
+    skipped = set(skipped)
+    sheet_names = [name for name in sheet_names if name not in skipped]
+    if not sheet_names:
+        return [], True
+
+    max_workers = min(len(sheet_names), CACHE_READ_THREADS)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sheet_objs = list(
+            pool.map(
+                lambda sheet_name: EnergySheet.from_cache(
+                    file_path, sheet_name, cache_dir
+                ),
+                sheet_names,
+            )
+        )
+
+    summary_records = []
+    consistent = True
+    for sheet_name, sheet_obj in zip(sheet_names, sheet_objs):
+        if sheet_obj is None:
+            # 缓存缺失：只读取该工作表 (通常命中原始数据缓存)
+            logger.info(f"  工作表 {sheet_name} 缓存缺失，重新读取。")
+            sheet_obj = EnergySheet(file_path, sheet_name, cache_dir=cache_dir)
+            consistent = _check_sheet(sheet_obj, cache_dir) and consistent
+        summary_records.extend(sheet_obj.get_summary_records())
+    return summary_records, consistent
+
+
+def _process_one_file(file_path, cache_dir, cached_layout=None):
+    """
+    处理单个 Excel 文件：逐个工作表清洗、比对缓存并生成汇总记录。
+
+    作为进程池的工作函数，参数与返回值均可序列化。
+
+    Args:
+        file_path (str): Excel 文件路径。
+        cache_dir (str): 工作表缓存目录。
+        cached_layout (dict | None): 文件指纹与上次运行一致时记录的工作表划分
+            ({"sheets": 数据工作表列表, "skipped": 跳过的工作表列表})，
+            提供时直接读取缓存，不再解析 Excel。
+
+    Returns:
+        tuple: (summary_records, layout)。summary_records 为该文件所有
+            工作表的汇总记录 (处理失败时为已完成部分)；layout 为全部数据工作表
+            均与缓存一致 (或已保存为新缓存) 时的工作表划分 (格式同 cached_layout)，
+            否则为 None。缺少必需列的工作表 (如封面、说明页) 每次结果相同，
+            记入 skipped 而不影响一致性。
+    """
+    from energy_models import EnergySheet
+
+    logger = logging.getLogger(__name__)
+    file_name = os.path.basename(file_path)
+
+    if cached_layout is not None:
+        try:
+            summary_records, consistent = _load_cached_file(
+                file_path,
+                cache_dir,
+                cached_layout["sheets"],
+                cached_layout["skipped"],
+            )
+        except Exception as e:
+            logger.warning(f"读取文件 {file_name} 的缓存失败，重新处理: {e}")
+        else:
+            logger.info(f"文件 {file_name} 未发生变化，直接使用缓存数据。")
+            return summary_records, (cached_layout if consistent else None)
+
+    logger.info(f"正在处理文件: {file_name}")
+
+    summary_records = []
+    sheet_names = []
+    skipped = []
+    consistent = True
+    try:
+        # 只打开一次工作簿并逐个处理工作表：每个工作表只保留汇总记录，
+        # 原始与清洗后的数据在处理下一个工作表前即可释放
+        for sheet_name, raw_df in EnergySheet.iter_workbook(file_path, cache_dir):
+            logger.info(f"  正在处理工作表: {sheet_name}")
+
+            # Use the EnergySheet class (数据已读取，无需重新打开工作簿)
+            sheet_obj = EnergySheet.from_frame(raw_df, sheet_name, file_path, cache_dir)
+            if sheet_obj.missing_cols:
+                # 非数据工作表：结果只取决于文件内容，文件未变化时无需再次检查
+                skipped.append(sheet_name)
+                continue
+            consistent = _check_sheet(sheet_obj, cache_dir) and consistent
+
+            summary_records.extend(sheet_obj.get_summary_records())
+            sheet_names.append(sheet_name)
+
+    except Exception as e:
+        consistent = False
+        logger.error(f"处理文件 {file_name} 失败: {e}", exc_info=True)
+
+    # 只有全部工作表都与缓存一致时才记录指纹，否则下次运行仍需完整检查
+    layout = {"sheets": sheet_names, "skipped": skipped}
+    return summary_records, (layout if consistent else None)
 
 
 def process_excel_files():
@@ -44,119 +334,178 @@ def process_excel_files():
     2. 遍历输入目录下的所有 Excel 文件。
     3. 对每个工作表进行清洗、缓存比对和汇总。
     4. 将所有汇总数据合并，并生成透视表。
-    5. 将最终结果保存为 Excel 文件。
+    5. 将最终结果保存为 Parquet 文件供图表读取，并按配置 (export_xlsx)
+       导出 Excel 报表。
     """
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from energy_models import EnergySheet
+
     # Load configuration
     config = load_config()
 
     # Setup logging
     log_level_str = config.get("log_level", "INFO")
-    log_level = getattr(logging, log_level_str.upper(), logging.INFO)
+    log_level = _LEVELS.get(log_level_str.upper(), logging.INFO)
     log_file = config.get("log_file", "./logs/app.log")
     logger = setup_logger(log_level=log_level, log_file=log_file)
 
     input_dir = config["paths"]["input_dir"]
     output_dir = config["paths"]["output_dir"]
 
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        logger.info(f"已创建输出目录: {output_dir}")
+    os.makedirs(output_dir, exist_ok=True)
 
-    summary_data = []
+    summary_records = []
 
-    files = [
-        f
-        for f in os.listdir(input_dir)
-        if f.endswith(".xlsx") and not f.startswith("~$")
-    ]
+    # scandir 返回的目录项自带文件类型信息并缓存 stat 结果，
+    # 后续的文件指纹直接复用，无需再按路径逐个 stat
+    with os.scandir(input_dir) as it:
+        entries = [
+            e
+            for e in it
+            if e.name.endswith(".xlsx") and not e.name.startswith("~$") and e.is_file()
+        ]
 
-    if not files:
+    if not entries:
         logger.warning("输入目录中未找到 Excel 文件。")
         return
 
-    for file_name in files:
-        file_path = os.path.join(input_dir, file_name)
-        logger.info(f"正在处理文件: {file_name}")
-
-        try:
-            xls = pd.ExcelFile(file_path)
-            for sheet_name in xls.sheet_names:
-                logger.info(f"  正在处理工作表: {sheet_name}")
-
-                # Use the EnergySheet class
-                sheet_obj = EnergySheet(file_path, sheet_name)
-
-                # Compare with cache and save if new
-                cache_dir = os.path.join(os.path.dirname(output_dir), "data")
-                comparison_result = sheet_obj.compare_with_cache(
-                    cache_dir, format="parquet"
-                )
-
-                if comparison_result == "NEW":
-                    logger.info(f"检测到新工作表: {sheet_name}。正在保存到缓存。")
-                    sheet_obj.save_data(cache_dir, format="parquet")
-                elif comparison_result == "MATCH":
-                    logger.info(f"工作表 {sheet_name} 数据一致性检查通过。")
-                elif comparison_result == "MISMATCH":
-                    logger.error(
-                        f"文件 {file_name} 中的工作表 {sheet_name} "
-                        "与缓存数据不匹配！跳过缓存更新。"
-                    )
+    cache_dir = os.path.join(os.path.dirname(output_dir), "data")
+
+    # 与上次运行指纹一致的文件直接使用缓存
+    # (缓存格式标记不同的旧指纹视为未命中)
+    old_fingerprints = _load_fingerprints(cache_dir)
+    cache_schema = EnergySheet.cache_schema()
+    fingerprints = {}
+    cached_layouts = {}
+    for entry in entries:
+        fingerprint = _file_fingerprint(entry, cache_schema)
+        fingerprints[entry.name] = fingerprint
+        previous = old_fingerprints.get(entry.name)
+        if previous is not None and all(
+            previous.get(key) == value for key, value in fingerprint.items()
+        ):
+            cached_layouts[entry.name] = {
+                "sheets": previous.get("sheets") or [],
+                "skipped": previous.get("skipped") or [],
+            }
+
+    # 各文件相互独立且解析为 CPU 密集型，使用多进程并行处理；
+    # 子进程的日志经队列交给主进程的处理器统一输出
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *logger.handlers, respect_handler_level=True
+    )
+    listener.start()
+    # 分别统计解析阶段 (计算密集) 与汇总写出阶段 (内存带宽密集) 的耗时，
+    # 便于判断当前部署的瓶颈所在
+    parse_start = time.perf_counter_ns()
+    try:
+        max_workers = min(len(entries), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(log_queue, log_level),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _process_one_file,
+                    entry.path,
+                    cache_dir,
+                    cached_layouts.get(entry.name),
+                ): entry.name
+                for entry in entries
+            }
+            for future in as_completed(futures):
+                file_name = futures[future]
+                try:
+                    records, layout = future.result()
+                except Exception as e:
+                    logger.error(f"处理文件 {file_name} 失败: {e}", exc_info=True)
+                    layout = None
                 else:
-                    logger.error(f"检查工作表 {sheet_name} 的缓存时出错。")
-
-                summary = sheet_obj.get_summary()
+                    summary_records.extend(records)
 
-                if summary is not None:
-                    summary_data.append(summary)
-
-        except Exception as e:
-            logger.error(f"处理文件 {file_name} 失败: {e}", exc_info=True)
+                if layout is None:
+                    # 未能完整验证的文件不记录指纹
+                    del fingerprints[file_name]
+                else:
+                    fingerprints[file_name].update(layout)
+    finally:
+        listener.stop()
+    logger.info(
+        f"phase=parse files={len(entries)} ns={time.perf_counter_ns() - parse_start}"
+    )
+
+    _save_fingerprints(cache_dir, fingerprints)
+
+    if summary_records:
+        pivot_start = time.perf_counter_ns()
+        # 汇总记录直接构建为 Arrow 表，由 Arrow 的哈希聚合 (C++ 实现) 完成分组求和，
+        # 省去 pandas 的 groupby/unstack 重排
+        table = pa.Table.from_pylist(
+            summary_records,
+            schema=pa.schema(
+                [
+                    ("日期区间", pa.string()),
+                    ("能源类型", pa.string()),
+                    ("费用(元)", pa.float64()),
+                ]
+            ),
+        )
+        agg = table.group_by(["日期区间", "能源类型"]).aggregate([("费用(元)", "sum")])
 
-    if summary_data:
-        final_df = pd.concat(summary_data, ignore_index=True)
+        # 行按日期区间排序；列按目标顺序排列 (不在目标列表中的类型按名称排在最后)，
+        # 只保留实际出现的能源类型
+        date_labels = sorted(set(agg["日期区间"].to_pylist()))
+        type_labels, cost_columns = _column_layout(
+            frozenset(agg["能源类型"].to_pylist())
+        )
 
         # Pivot the table to have Energy Types as headers
-        pivot_df = final_df.pivot_table(
-            index=["日期区间"],
-            columns="能源类型",
-            values=["费用(元)"],
-            aggfunc="sum",
-            fill_value=0,
+        # (按行/列标签的位置把聚合值直接写入 C 连续的 float64 矩阵，缺失组合为 0)
+        row_idx = pc.index_in(agg["日期区间"], value_set=pa.array(date_labels))
+        col_idx = pc.index_in(agg["能源类型"], value_set=pa.array(type_labels))
+        cost_matrix = np.zeros((len(date_labels), len(type_labels)), dtype=np.float64)
+        cost_matrix[row_idx.to_numpy(), col_idx.to_numpy()] = agg[
+            "费用(元)_sum"
+        ].to_numpy()
+
+        # Flatten columns (e.g., 电_费用(元)) and calculate total cost
+        pivot_df = pd.DataFrame(
+            {
+                "日期区间": date_labels,
+                **dict(zip(cost_columns, cost_matrix.T)),
+                "总费用(元)": cost_matrix.sum(axis=1),
+            }
         )
 
-        # Swap levels to group by Energy Type (e.g., 电_费用)
-        pivot_df.columns = pivot_df.columns.swaplevel(0, 1)
-        pivot_df.sort_index(axis=1, level=0, inplace=True)
-
-        # Flatten MultiIndex columns
-        pivot_df.columns = [f"{col[0]}_{col[1]}" for col in pivot_df.columns]
-
-        # Reset index to make '日期区间' a normal column
-        pivot_df.reset_index(inplace=True)
-
-        # Reorder columns based on specific order
-        ordered_columns = ["日期区间"]
-        target_order = ["电", "采暖热表", "生活热水表", "自来水", "中水", "燃气"]
-
-        for energy_type in target_order:
-            col_cost = f"{energy_type}_费用(元)"
-            if col_cost in pivot_df.columns:
-                ordered_columns.append(col_cost)
-
-        # Add any remaining columns that might not be in the target list (just in case)
-        remaining_cols = [col for col in pivot_df.columns if col not in ordered_columns]
-        ordered_columns.extend(remaining_cols)
-
-        pivot_df = pivot_df[ordered_columns]
-
-        # Calculate total cost
-        cost_cols = [col for col in pivot_df.columns if col.endswith("_费用(元)")]
-        pivot_df["总费用(元)"] = pivot_df[cost_cols].sum(axis=1)
-
-        output_path = os.path.join(output_dir, "energy_usage_summary.xlsx")
-        pivot_df.to_excel(output_path, index=False)
-        logger.info(f"汇总已保存至 {output_path}")
+        # Parquet 供图表模块读取 (远快于解析 Excel)，xlsx 仅供人工查看
+        parquet_path = os.path.join(output_dir, "energy_usage_summary.parquet")
+        pivot_df.to_parquet(
+            parquet_path, engine="pyarrow", compression="snappy", index=False
+        )
+        logger.info(f"汇总 Parquet 已保存至 {parquet_path}")
+
+        # 面向人工查看的 Excel 报表，可通过配置 export_xlsx 关闭
+        if config.get("export_xlsx", True):
+            output_path = os.path.join(output_dir, "energy_usage_summary.xlsx")
+            with pd.ExcelWriter(output_path, **XLSX_WRITER_KWARGS) as writer:
+                pivot_df.to_excel(writer, index=False, sheet_name="summary")
+            logger.info(f"汇总已保存至 {output_path}")
+
+            # 同时输出 CSV，便于其他工具直接读取 (utf-8-sig 保证 Excel 正确显示中文)
+            csv_path = os.path.join(output_dir, "energy_usage_summary.csv")
+            pivot_df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+            logger.info(f"汇总 CSV 已保存至 {csv_path}")
+        else:
+            output_path = parquet_path
+        logger.info(
+            f"phase=pivot rows={len(pivot_df)} "
+            f"ns={time.perf_counter_ns() - pivot_start}"
+        )
         print(f"处理完成。汇总已保存至 {output_path}")
     else:
         logger.warning("未处理任何数据。")